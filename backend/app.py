@@ -39,6 +39,7 @@ CORS(app)
 
 JWT_SECRET = os.getenv("JWT_SECRET", "supersecret")
 JWT_EXPIRY_MINUTES = int(os.getenv("JWT_EXPIRY_MINUTES", 60))
+JWT_REMEMBER_ME_HOURS = int(os.getenv("JWT_REMEMBER_ME_HOURS", 24))
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -90,53 +91,68 @@ def health_check():
     return jsonify({"status": "ok", "message": "Backend server is running"})
 
 
-@app.route('/upload', methods=['POST'])
-def upload_image():
-    try:
-        if 'image' not in request.files:
-            app.logger.error("No image file provided in the request.")
-            return jsonify({"error": "No image file provided."}), 400
+def run_detection(img_bytes):
+    """Run every detection model on the image and return (detections, base64 annotated PNG)."""
+    image = Image.open(io.BytesIO(img_bytes)).convert("RGB")
+
+    # Resize large images before processing
+    image = resize_image(image)
+
+    annotated = np.array(image)  # Convert to NumPy for OpenCV
+
+    combined_results = {}
 
-        file = request.files['image']
-        if file.filename == '':
-            app.logger.error("Empty filename received.")
-            return jsonify({"error": "Empty filename."}), 400
+    for model_name, model in models.items():
+        results = model(image)
+        objects = []
 
-        img_bytes = file.read()
-        image = Image.open(io.BytesIO(img_bytes)).convert("RGB")
+        for result in results:
+            draw_custom_boxes(annotated, result, model_name)
 
-        # Resize large images before processing
-        image = resize_image(image)
+            boxes = result.boxes.xyxy.cpu().numpy()
+            confidences = result.boxes.conf.cpu().numpy()
+            classes = result.boxes.cls.cpu().numpy()
 
-        annotated = np.array(image)  # Convert to NumPy for OpenCV
+            for box, confidence, cls in zip(boxes, confidences, classes):
+                objects.append({
+                    "name": result.names[int(cls)],
+                    "confidence": round(float(confidence), 3),
+                    "bbox": [round(coord, 2) for coord in box.tolist()]
+                })
 
-        combined_results = {}
+        combined_results[model_name] = objects
 
-        for model_name, model in models.items():
-            results = model(image)
-            objects = []
+    # Encode final image with all annotations
+    annotated_image = Image.fromarray(annotated)
+    buffered = io.BytesIO()
+    annotated_image.save(buffered, format="PNG")
+    encoded_image = base64.b64encode(buffered.getvalue()).decode("utf-8")
 
-            for result in results:
-                draw_custom_boxes(annotated, result, model_name)
+    return combined_results, encoded_image
 
-                boxes = result.boxes.xyxy.cpu().numpy()
-                confidences = result.boxes.conf.cpu().numpy()
-                classes = result.boxes.cls.cpu().numpy()
 
-                for box, confidence, cls in zip(boxes, confidences, classes):
-                    objects.append({
-                        "name": result.names[int(cls)],
-                        "confidence": round(float(confidence), 3),
-                        "bbox": [round(coord, 2) for coord in box.tolist()]
-                    })
+def _read_image_upload():
+    """Return (img_bytes, None) for a valid multipart upload, or (None, error response)."""
+    if 'image' not in request.files:
+        app.logger.error("No image file provided in the request.")
+        return None, (jsonify({"error": "No image file provided."}), 400)
 
-            combined_results[model_name] = objects
+    file = request.files['image']
+    if file.filename == '':
+        app.logger.error("Empty filename received.")
+        return None, (jsonify({"error": "Empty filename."}), 400)
+
+    return file.read(), None
+
+
+@app.route('/upload', methods=['POST'])
+def upload_image():
+    try:
+        img_bytes, error = _read_image_upload()
+        if error:
+            return error
 
-        # Encode final image with all annotations
-        annotated_image = Image.fromarray(annotated)
-        buffered = io.BytesIO()
-        annotated_image.save(buffered, format="PNG")
-        encoded_image = base64.b64encode(buffered.getvalue()).decode("utf-8")
+        combined_results, encoded_image = run_detection(img_bytes)
 
         return jsonify({
             "detected_objects": combined_results,
@@ -189,13 +205,17 @@ def contact():
         return jsonify({"status": "error", "message": str(e)}), 500
 
 # JWT helper
-def generate_token(user_id):
+def generate_token(user_id, remember_me=False):
+    if remember_me:
+        expiry = datetime.now(timezone.utc) + timedelta(hours=JWT_REMEMBER_ME_HOURS)
+    else:
+        expiry = datetime.now(timezone.utc) + timedelta(minutes=JWT_EXPIRY_MINUTES)
     payload = {
         "user_id": user_id,
-        "exp": datetime.now(timezone.utc) + timedelta(minutes=JWT_EXPIRY_MINUTES)
+        "exp": expiry
     }
     token = jwt.encode(payload, JWT_SECRET, algorithm="HS256")
-    return token
+    return token, expiry
 
 @app.route("/register", methods=["POST"])
 def register():
@@ -214,16 +234,26 @@ def login():
 
     result = login_user(username_or_email, password)
     if result["status"] == "success":
-        token = generate_token(result["user_id"])
+        token, expiry = generate_token(result["user_id"], data.get("remember_me", False))
         return jsonify({
             "status": "success",
             "token": token,
+            "expires_at": expiry.isoformat(),
             "username": result["username"],
             "bio": result.get("bio", ""),  # ✅ include bio
             "profile_picture": result.get("profile_picture", "")  # ✅ include profile_picture
         })
     return jsonify(result)
 
+@app.route("/validate-token", methods=["POST"])
+def validate_token():
+    data = request.json
+    try:
+        jwt.decode(data.get("token", ""), JWT_SECRET, algorithms=["HS256"])
+        return jsonify({"status": "success", "valid": True})
+    except jwt.InvalidTokenError:
+        return jsonify({"status": "success", "valid": False})
+
 @app.route("/request-reset-code", methods=["POST"])
 def request_reset_code():
     data = request.json
@@ -293,7 +323,13 @@ def get_reports():
         if not username:
             return jsonify({"status": "error", "message": "Missing username"}), 400
 
-        result = get_reports_by_username(username)
+        try:
+            limit = max(int(data.get("limit", 0)), 0)
+            offset = max(int(data.get("offset", 0)), 0)
+        except (TypeError, ValueError):
+            return jsonify({"status": "error", "message": "Invalid limit/offset"}), 400
+
+        result = get_reports_by_username(username, limit=limit, offset=offset)
         return jsonify(result)
 
     except Exception as e:
@@ -340,6 +376,41 @@ def admin_get_all_reports():
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)}), 500
 
+def evaluate_detections(detections, base64_image):
+    """Ask GitHub AI to interpret the detections, falling back to a local note if it is unavailable."""
+    # Always try to use GitHub AI first, even if no detections from local models
+    try:
+        app.logger.info("Calling GitHub AI for evaluation and marking")
+        github_ai = GitHubAIClient()
+        result = github_ai.generate_interpretation(detections, base64_image)
+
+        if result["status"] == "success":
+            # Create a response that includes any marked image
+            response = {
+                "status": "success",
+                "evaluation": result["evaluation"]
+            }
+
+            # Include marked image if available
+            if "marked_image" in result:
+                app.logger.info("Marked image received from GitHub AI")
+                response["marked_image"] = result["marked_image"]
+            else:
+                app.logger.warning("No marked image received from GitHub AI")
+
+            return response
+        else:
+            app.logger.warning(f"GitHub AI failed: {result.get('message')}. Using fallback analysis.")
+    except Exception as e:
+        app.logger.exception(f"Error using GitHub AI: {str(e)}. Using fallback analysis.")
+
+    return {
+        "status": "success",
+        "evaluation": "analysis:",
+        "note": "This analysis was generated using a local fallback system as the advanced AI analysis service was unavailable."
+    }
+
+
 @app.route("/evaluate", methods=["POST"])
 def evaluate_image():
     try:
@@ -349,38 +420,8 @@ def evaluate_image():
 
         if not base64_image:
             return jsonify({"status": "error", "message": "Missing image data"}), 400
-            
-        # Always try to use GitHub AI first, even if no detections from local models
-        try:
-            app.logger.info("Calling GitHub AI for evaluation and marking")
-            github_ai = GitHubAIClient()
-            result = github_ai.generate_interpretation(detections, base64_image)
-            
-            if result["status"] == "success":
-                # Create a response that includes any marked image
-                response = {
-                    "status": "success",
-                    "evaluation": result["evaluation"]
-                }
-                
-                # Include marked image if available
-                if "marked_image" in result:
-                    app.logger.info("Marked image received from GitHub AI")
-                    response["marked_image"] = result["marked_image"]
-                else:
-                    app.logger.warning("No marked image received from GitHub AI")
-
-                return jsonify(response)
-            else:
-                app.logger.warning(f"GitHub AI failed: {result.get('message')}. Using fallback analysis.")
-        except Exception as e:
-            app.logger.exception(f"Error using GitHub AI: {str(e)}. Using fallback analysis.")
 
-        return jsonify({
-            "status": "success",
-            "evaluation": "analysis:",
-            "note": "This analysis was generated using a local fallback system as the advanced AI analysis service was unavailable."
-        })
+        return jsonify(evaluate_detections(detections, base64_image))
 
     except Exception as e:
         app.logger.exception("Evaluation failed")
@@ -389,6 +430,32 @@ def evaluate_image():
             "message": f"Evaluation failed: {str(e)}"
         }), 500
 
+
+# Detection + AI evaluation in one request, so the client doesn't send the annotated image back
+@app.route("/analyze", methods=["POST"])
+def analyze_image():
+    try:
+        img_bytes, error = _read_image_upload()
+        if error:
+            return error
+
+        combined_results, encoded_image = run_detection(img_bytes)
+    except Exception as e:
+        app.logger.exception("Detection failed")
+        return jsonify({"error": f"Detection failed: {str(e)}"}), 500
+
+    try:
+        evaluation_result = evaluate_detections(combined_results, encoded_image)
+    except Exception as e:
+        app.logger.exception("Evaluation failed")
+        evaluation_result = {"status": "error", "message": f"Evaluation failed: {str(e)}"}
+
+    # The annotated image is only needed for the AI evaluation; the frontend never displays it
+    return jsonify({
+        "detected_objects": combined_results,
+        "evaluation_result": evaluation_result
+    })
+
 @app.route("/submit_feedback", methods=["POST"])
 def submit_feedback():
     try:
@@ -429,5 +496,7 @@ def submit_feedback():
 
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
+    # The debugger and the reloader (a second copy of the app and its models) are for development only
+    dev_mode = os.getenv("TOWNSENSE_DEV") == "1"
+    app.run(debug=dev_mode, port=5000, use_reloader=dev_mode)
 
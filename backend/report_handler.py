@@ -45,16 +45,17 @@ def save_user_report(username, location, details, image_bytes):
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
-def get_reports_by_username(username):
+def get_reports_by_username(username, limit=0, offset=0):
     try:
         # Only return reports marked as visible
-        results = list(reports_collection.find(
-            {"username": username, "visible": True}
-        ).sort("timestamp", -1))
+        query = {"username": username, "visible": True}
+        # limit=0 means no limit, so callers that don't paginate still get everything
+        results = list(reports_collection.find(query).sort("timestamp", -1).skip(offset).limit(limit))
 
         for r in results:
             r["_id"] = str(r["_id"])  # Convert ObjectId to string
-        return {"status": "success", "reports": results}
+        total = reports_collection.count_documents(query)
+        return {"status": "success", "reports": results, "total": total}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -0,0 +1,16 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared HTTP session so backend calls reuse kept-alive connections
+SESSION = requests.Session()
+
+# One quick retry for refused connections / gateway errors instead of surfacing the first hiccup.
+# Status retries only apply to idempotent methods, so a POST is never re-sent once the server has it.
+_retries = Retry(
+    total=1, connect=1, backoff_factor=0.1, backoff_jitter=0.1,
+    status_forcelist=[502, 503, 504], respect_retry_after_header=True
+)
+_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=_retries)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
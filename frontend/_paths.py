@@ -0,0 +1,7 @@
+# Asset locations, resolved once per process and shared by ui.py and the pages
+from pathlib import Path
+
+ASSETS_DIR = Path(__file__).resolve().parent / "assets"
+LOGO_PATH = ASSETS_DIR / "small_name_logo.svg"
+SMALL_LOGO_PATH = ASSETS_DIR / "smaller_logo.png"
+CHECKMARK_PATH = ASSETS_DIR / "checkmark.svg"
@@ -0,0 +1,35 @@
+# Navbar config lives here rather than in ui.py, which Streamlit re-executes on every rerun
+from frontend._paths import LOGO_PATH
+
+nav_pages = ["Homepage", "Detection", "History", "Contact", "Account"]
+# Checked once here; a missing logo just renders the navbar without one
+nav_logo_path = str(LOGO_PATH) if LOGO_PATH.is_file() else None
+nav_styles = {
+    "nav": {
+        "background-color": "#f5f5f5",
+        "justify-content": "left",
+        "font-family": "Verdana, sans-serif"
+    },
+    "img": {
+        "padding-right": "14px",
+    },
+    "span": {
+        "color": "black",
+        "padding": "14px",
+        "transition": "color 0.25s ease-out, background-color 0.25s ease-out",
+    },
+    "active": {
+        "background-color": "#f7f7f7",
+        "padding": "14px",
+    },
+    "hover": {
+        "color": "#775cff",
+        "background-color": "#f7f7f7",
+        "padding": "14px",
+        "transition": "color 0.25s ease-out, background-color 0.25s ease-out",
+    }
+}
+nav_options = {
+    "show_menu": False,
+    "show_sidebar": False,
+}
@@ -1,5 +1,16 @@
-from .account import show_account
-from .home import show_home
-from .detection import show_detection
-from .history import show_history
-from .contact import show_contact
\ No newline at end of file
+import importlib
+
+# Page modules are imported on first use (PEP 562), so a cold start only loads the page being shown
+_PAGE_MODULES = {
+    "show_account": ".account",
+    "show_home": ".home",
+    "show_detection": ".detection",
+    "show_history": ".history",
+    "show_contact": ".contact",
+}
+
+
+def __getattr__(name):
+    if name in _PAGE_MODULES:
+        return getattr(importlib.import_module(_PAGE_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,17 +1,20 @@
-from time import sleep
+from time import sleep, monotonic
 import base64
 import io
 import os
+import orjson
 import requests
-from PIL import Image
+from threading import Thread
+from functools import lru_cache
 import streamlit as st
-from streamlit_avatar import avatar
+from streamlit.runtime.scriptrunner import add_script_run_ctx
 from dotenv import load_dotenv
 from streamlit_cookies_manager import EncryptedCookieManager
-from streamlit_extras.add_vertical_space import add_vertical_space
-from streamlit_extras.stylable_container import stylable_container
-from frontend.styles import purple_button_style, hover_text_purple
+from frontend.styles import purple_button_style, primary_button_style, hover_text_purple, scoped_style
+from frontend._http import SESSION
+from .contact import is_valid_email
 from datetime import datetime, timedelta, timezone
+from frontend._paths import CHECKMARK_PATH
 
 # --- Load environment ---
 load_dotenv()  # ✅ Load .env at start
@@ -28,13 +31,18 @@ if not cookies.ready():
     st.stop()
 
 API_BASE = "http://localhost:5000"
+TOKEN_REVALIDATE_SECONDS = 300
+# (connect, read) seconds; the backend is local so a refused connect fails fast
+API_TIMEOUT = (0.5, 3.0)
 
 # --- Load custom checkbox SVG ---
-svg_path = os.path.join(os.path.dirname(__file__), "..", "assets", "checkmark.svg")
-with open(svg_path, "rb") as f:
-    encoded_svg = base64.b64encode(f.read()).decode("utf-8")
+@st.cache_resource
+def _load_checkmark_svg():
+    return base64.b64encode(CHECKMARK_PATH.read_bytes()).decode("utf-8")
 
-remember_checkbox_style = f"""
+@st.cache_resource
+def _remember_checkbox_style(encoded_svg):
+    return f"""
 div[data-testid="stCheckbox"] {{
     background-color: white;
     padding: 6px 12px;
@@ -51,70 +59,181 @@ div[data-testid="stCheckbox"] .st-du {{
 }}
 """
 
+encoded_svg = _load_checkmark_svg()
+remember_checkbox_style = _remember_checkbox_style(encoded_svg)
+
+# Page stylesheet, assembled once at import
+_ACCOUNT_CSS = (
+    "<style>"
+    + primary_button_style
+    + scoped_style("profile_upload_button", purple_button_style)
+    + scoped_style("remember_me", remember_checkbox_style)
+    + scoped_style("reset_pass", hover_text_purple)
+    + "</style>"
+)
+
 # --- Helper API functions ---
+@lru_cache(maxsize=32)
 def api_url(path):
     return f"{API_BASE}/{path}"
 
-def post_api(path, payload):
-    if not st.session_state.get("backend_available", False):
-        st.warning("⚠️ Cannot connect to backend server")
+@st.cache_data(ttl=10, show_spinner=False)
+def _backend_up():
+    try:
+        SESSION.get(api_url(""), timeout=0.5)
+        return True
+    except requests.exceptions.RequestException:
+        return False
+
+def post_api(path, payload, notify=True, timeout=API_TIMEOUT):
+    if not _backend_up():
+        if notify:
+            st.warning("⚠️ Cannot connect to backend server")
         return {"status": "error", "message": "Backend server not available"}
     try:
-        res = requests.post(api_url(path), json=payload, timeout=5)
-        return res.json()
+        res = SESSION.post(
+            api_url(path),
+            data=orjson.dumps(payload),
+            headers={"Content-Type": "application/json"},
+            timeout=timeout
+        )
+        return orjson.loads(res.content)
     except requests.exceptions.Timeout:
-        st.error("⚠️ Request to backend timed out")
+        if notify:
+            st.error("⚠️ Request to backend timed out")
         return {"status": "error", "message": "Request timed out"}
+    except requests.exceptions.ConnectionError:
+        if notify:
+            st.warning("⚠️ Cannot connect to backend server")
+        return {"status": "error", "message": "Backend server not available"}
     except Exception as e:
-        st.error("⚠️ Failed to connect to backend.")
+        if notify:
+            st.error("⚠️ Failed to connect to backend.")
         return {"status": "error", "message": str(e)}
 
-# --- Password Reset ---
-def handle_password_reset():
-    if st.session_state.reset_step == 1:
-        email = st.text_input("Enter your email to receive a reset code")
-        with stylable_container("send_reset_button", css_styles=purple_button_style):
-            if st.button("Send Reset Code"):
-                data = post_api("request-reset-code", {"email": email})
-                if data.get("status") == "success":
-                    st.session_state.reset_email = email
-                    st.session_state.reset_step = 2
-                    st.rerun()
-                else:
-                    st.error(data.get("message"))
+# --- Background requests ---
+def _run_async(fn, key):
+    """Run fn on a worker thread and store its result in st.session_state[key]."""
+    st.session_state.pop(key, None)
+    st.session_state[f"{key}_pending"] = True
+    thread = Thread(target=lambda: st.session_state.__setitem__(key, fn()), daemon=True)
+    add_script_run_ctx(thread)
+    thread.start()
+
+@st.fragment(run_every=0.1)
+def _await_result(key, on_success):
+    if key not in st.session_state:
+        st.caption("⏳ Contacting server...")
+        return
+    data = st.session_state.pop(key)
+    st.session_state.pop(f"{key}_pending", None)
+    if data.get("status") == "success":
+        on_success(data)
+    else:
+        st.session_state[f"{key}_error"] = data.get("message")
+    st.rerun()
+
+def _show_async_result(key, on_success):
+    if st.session_state.get(f"{key}_pending"):
+        _await_result(key, on_success)
+    elif f"{key}_error" in st.session_state:
+        st.error(st.session_state.pop(f"{key}_error"))
+
+def _on_reset_code_sent(data):
+    st.session_state.reset_step = 2
+
+def _on_password_reset(data):
+    st.session_state.auth_mode = "login"
+    st.session_state.reset_step = 1
+
+def _on_login(data):
+    st.session_state.token = data["token"]
+    st.session_state.username = data["username"]
+    st.session_state.bio = data.get("bio", "")
+    st.session_state.profile_picture = data.get("profile_picture", "")
+
+    st.session_state._last_validated = monotonic()
+
+    if st.session_state.get("login_remember"):
+        expiry_time = datetime.now(timezone.utc) + timedelta(hours=24)
+        cookies["token"] = data["token"]
+        cookies["username"] = data["username"]
+        cookies["bio"] = data.get("bio", "")
+        cookies["profile_picture"] = data.get("profile_picture", "")
+        cookies["expiry"] = data.get("expires_at", expiry_time.isoformat())
+        cookies.save()
+
+def _on_register(data):
+    st.session_state.auth_mode = "login"
+
+# --- Persistent login ---
+def _forget_login():
+    cookies.pop("token", None)
+    cookies.pop("username", None)
+    cookies.pop("expiry", None)
+    cookies.save()
+
+def _token_still_valid():
+    """Re-check a cookie-restored token with the backend at most every TOKEN_REVALIDATE_SECONDS."""
+    last = st.session_state.get("_last_validated", 0)
+    if last and monotonic() - last < TOKEN_REVALIDATE_SECONDS:
+        return True
+    data = post_api("validate-token", {"token": st.session_state.token}, notify=False)
+    if data.get("status") != "success":
+        # Backend unreachable: keep the session and try again on a later run
+        return True
+    st.session_state._last_validated = monotonic()
+    return data.get("valid", False)
 
-    elif st.session_state.reset_step == 2:
-        st.success("✅ Reset code sent. Please check your email.")
-        code = st.text_input("Enter the 6-digit reset code")
-        new_password = st.text_input("New password", type="password")
-        confirm_password = st.text_input("Confirm new password", type="password")
+# --- Password Reset ---
+def _render_reset_step1():
+    email = st.text_input("Enter your email to receive a reset code")
+    if st.button("Send Reset Code", type="primary"):
+        if not is_valid_email(email.strip()):
+            st.warning("Please enter a valid email address.")
+            return
+        st.session_state.reset_email = email
+        _run_async(lambda: post_api("request-reset-code", {"email": email}, notify=False, timeout=(0.5, 15.0)), "reset_code_result")
+    _show_async_result("reset_code_result", _on_reset_code_sent)
+
+def _render_reset_step2():
+    st.success("✅ Reset code sent. Please check your email.")
+    code = st.text_input("Enter the 6-digit reset code")
+    new_password = st.text_input("New password", type="password")
+    confirm_password = st.text_input("Confirm new password", type="password")
+
+    if st.button("Reset Password", type="primary"):
+        if not code.strip() or not new_password:
+            st.warning("Please enter the reset code and a new password.")
+            return
+        if new_password != confirm_password:
+            st.warning("Passwords do not match")
+            return
+        payload = {
+            "email": st.session_state.reset_email,
+            "code": code,
+            "new_password": new_password
+        }
+        _run_async(lambda: post_api("reset-password", payload, notify=False), "reset_password_result")
+    _show_async_result("reset_password_result", _on_password_reset)
+
+    if st.button("Cancel Reset", type="primary"):
+        st.session_state.reset_step = 1
+        st.rerun()
 
-        with stylable_container("reset_password_button", css_styles=purple_button_style):
-            if st.button("Reset Password"):
-                if new_password != confirm_password:
-                    st.warning("Passwords do not match")
-                    return
-                payload = {
-                    "email": st.session_state.reset_email,
-                    "code": code,
-                    "new_password": new_password
-                }
-                data = post_api("reset-password", payload)
-                if data.get("status") == "success":
-                    st.success("✅ Password reset successfully. Please log in.")
-                    st.session_state.auth_mode = "login"
-                    st.session_state.reset_step = 1
-                    st.rerun()
-                else:
-                    st.error(data.get("message"))
+_RESET_STEPS = {
+    1: _render_reset_step1,
+    2: _render_reset_step2,
+}
 
-        with stylable_container("cancel_reset_button", css_styles=purple_button_style):
-            if st.button("Cancel Reset"):
-                st.session_state.reset_step = 1
-                st.rerun()
+@st.fragment
+def handle_password_reset():
+    _RESET_STEPS[st.session_state.reset_step]()
 
 # --- Compress Uploaded Image ---
 def compress_image(uploaded_file, max_width=300):
+    from PIL import Image
+
     img = Image.open(uploaded_file)
     if img.width > max_width:
         ratio = max_width / float(img.width)
@@ -124,8 +243,173 @@ def compress_image(uploaded_file, max_width=300):
     img.save(buffer, format="PNG", optimize=True)
     return buffer.getvalue()
 
+# --- Views ---
+def _render_logged_in():
+    # Only the profile view needs these; keep them out of the login page's import path
+    from streamlit_avatar import avatar
+    from streamlit_extras.add_vertical_space import add_vertical_space
+
+    st.title("Account Settings")
+    st.markdown("---")
+
+    col1, col2 = st.columns(2, gap='large')
+    with col2:
+        st.header("Preview")
+        add_vertical_space(4)
+        avatar_items = []
+        if st.session_state.get("profile_picture"):
+            avatar_items.append({
+                "url": f"data:image/png;base64,{st.session_state['profile_picture']}",
+                "size": 200,
+                "title": st.session_state.get("username", "User"),
+                "caption": st.session_state.get("bio", "No bio yet"),
+                "key": "profile_avatar",
+            })
+        else:
+            avatar_items.append({
+                "url": f"https://api.dicebear.com/7.x/identicon/svg?seed={st.session_state.get('username', 'User')}",
+                "size": 200,
+                "title": st.session_state.get("username", "User"),
+                "caption": st.session_state.get("bio", "No bio yet"),
+                "key": "profile_avatar_fallback",
+            })
+
+        avatar(avatar_items)
+
+    with col1:
+        st.header("Account Customization")
+        new_display_name = st.text_input("Change display name", value=st.session_state.get("username", ""))
+        max_bio_length = 250
+        current_bio = st.session_state.get("bio", "")
+        bio = st.text_area(
+            "Bio",
+            value=current_bio,
+            max_chars=max_bio_length,
+            height=120,
+            key="bio_input"
+        )
+
+        with st.container(key="profile_upload_button"):
+            uploaded_picture = st.file_uploader("Profile picture", type=["jpg", "jpeg", "png"])
+
+    if st.button("Save Changes", type="primary"):
+        new_display_name = new_display_name.strip()
+        bio = bio.strip()
+        if len(new_display_name) < 3 or len(new_display_name) > 30:
+            st.warning("Username must be between 3 and 30 characters.")
+            return
+        if len(bio) > 250:
+            st.warning("Bio must be 250 characters or fewer.")
+            return
+
+        payload = {
+            "username": st.session_state.get("username"),
+            "new_display_name": new_display_name,
+            "bio": bio
+        }
+
+        if uploaded_picture:
+            if uploaded_picture.size > 1 * 1024 * 1024:
+                st.warning("Profile picture must be smaller than 1MB.")
+                return
+            compressed_image = compress_image(uploaded_picture)
+            payload["profile_picture"] = base64.b64encode(compressed_image).decode("utf-8")
+            st.session_state.profile_picture = payload["profile_picture"]
+
+        response = post_api("update_profile", payload)
+
+        if response.get("status") == "success":
+            st.success("✅ Profile updated successfully!")
+            st.session_state.username = new_display_name
+            st.session_state.bio = bio
+            sleep(1)
+            st.rerun()
+        else:
+            st.error(f"❌ Failed to update profile: {response.get('message')}")
+
+    st.markdown("---")
+    col1, col2, col3 = st.columns([2, 1, 2])
+    with col1:
+        if st.button("Logout", type="primary"):
+            _forget_login()
+            st.session_state.clear()
+            st.rerun()
+
+@st.fragment
+def _render_login():
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        st.title("Login")
+        if st.button("Don't have an account? Register here", type="primary"):
+            st.session_state.auth_mode = "register"
+            st.rerun()
+
+        with st.form("login_form"):
+            username_or_email = st.text_input("Username or Email")
+            password = st.text_input("Password", type="password")
+            with st.container(key="remember_me"):
+                remember = st.checkbox("Remember Me?", value=False)
+            submitted = st.form_submit_button("Login", type="primary")
+
+            if submitted and (not username_or_email.strip() or not password):
+                st.warning("Please enter your username or email and password.")
+            elif submitted:
+                payload = {
+                    "username_or_email": username_or_email,
+                    "password": password,
+                    "remember_me": remember
+                }
+                st.session_state.login_remember = remember
+                _run_async(lambda: post_api("login", payload, notify=False), "login_result")
+
+        _show_async_result("login_result", _on_login)
+
+        with st.container(key="reset_pass"):
+            with st.expander("Reset your password"):
+                handle_password_reset()
+
+@st.fragment
+def _render_register():
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col2:
+        st.title("Sign up")
+        if st.button("Already have an account? Log in here", type="primary"):
+            st.session_state.auth_mode = "login"
+            st.rerun()
+
+        with st.form("register_form"):
+            email = st.text_input("Email")
+            username = st.text_input("Username")
+            password = st.text_input("Password", type="password")
+            confirm_password = st.text_input("Confirm Password", type="password")
+            submitted = st.form_submit_button("Register", type="primary")
+
+            if submitted:
+                if not email.strip() or not username.strip() or not password:
+                    st.warning("Please fill in all fields.")
+                elif password != confirm_password:
+                    st.warning("Passwords do not match")
+                elif not is_valid_email(email.strip()):
+                    st.warning("Please enter a valid email address.")
+                else:
+                    payload = {
+                        "email": email,
+                        "username": username,
+                        "password": password
+                    }
+                    _run_async(lambda: post_api("register", payload, notify=False), "register_result")
+
+        _show_async_result("register_result", _on_register)
+
+_AUTH_VIEWS = {
+    "login": _render_login,
+    "register": _render_register,
+}
+
 # --- Main UI ---
 def show_account():
+    st.html(_ACCOUNT_CSS)
+
     if "auth_mode" not in st.session_state:
         st.session_state.auth_mode = "login"
     # --- Initialize Session State from Cookies ---
@@ -141,10 +425,7 @@ def show_account():
                 st.session_state.remember_me = True
             else:
                 # Token expired, clear cookies
-                cookies.pop("token", None)
-                cookies.pop("username", None)
-                cookies.pop("expiry", None)
-                cookies.save()
+                _forget_login()
                 st.session_state.token = None
         else:
             st.session_state.token = None
@@ -153,180 +434,13 @@ def show_account():
     if "backend_available" not in st.session_state:
         st.session_state.backend_available = True
 
-    if st.session_state.token:
-        st.title("Account Settings")
-        st.markdown("---")
-
-        col1, col2 = st.columns(2, gap='large')
-        with col2:
-            st.header("Preview")
-            add_vertical_space(4)
-            avatar_items = []
-            if st.session_state.get("profile_picture"):
-                avatar_items.append({
-                    "url": f"data:image/png;base64,{st.session_state['profile_picture']}",
-                    "size": 200,
-                    "title": st.session_state.get("username", "User"),
-                    "caption": st.session_state.get("bio", "No bio yet"),
-                    "key": "profile_avatar",
-                })
-            else:
-                avatar_items.append({
-                    "url": f"https://api.dicebear.com/7.x/identicon/svg?seed={st.session_state.get('username', 'User')}",
-                    "size": 200,
-                    "title": st.session_state.get("username", "User"),
-                    "caption": st.session_state.get("bio", "No bio yet"),
-                    "key": "profile_avatar_fallback",
-                })
-
-            avatar(avatar_items)
-
-        with col1:
-            st.header("Account Customization")
-            new_display_name = st.text_input("Change display name", value=st.session_state.get("username", ""))
-            max_bio_length = 250
-            current_bio = st.session_state.get("bio", "")
-            bio = st.text_area(
-                "Bio",
-                value=current_bio,
-                max_chars=max_bio_length,
-                height=120,
-                key="bio_input"
-            )
-
-            with stylable_container("profile_upload_button", css_styles=purple_button_style):
-                uploaded_picture = st.file_uploader("Profile picture", type=["jpg", "jpeg", "png"])
-
-        with stylable_container("save_changes_button", css_styles=purple_button_style):
-            if st.button("Save Changes"):
-                new_display_name = new_display_name.strip()
-                bio = bio.strip()
-                if len(new_display_name) < 3 or len(new_display_name) > 30:
-                    st.warning("Username must be between 3 and 30 characters.")
-                    return
-                if len(bio) > 250:
-                    st.warning("Bio must be 250 characters or fewer.")
-                    return
-
-                payload = {
-                    "username": st.session_state.get("username"),
-                    "new_display_name": new_display_name,
-                    "bio": bio
-                }
+    # Only cookie-restored logins are re-checked; a fresh login in this session was just issued by the backend
+    if st.session_state.token and st.session_state.get("remember_me") and not _token_still_valid():
+        _forget_login()
+        st.session_state.token = None
+        st.warning("Your session has expired. Please log in again.")
 
-                if uploaded_picture:
-                    if uploaded_picture.size > 1 * 1024 * 1024:
-                        st.warning("Profile picture must be smaller than 1MB.")
-                        return
-                    compressed_image = compress_image(uploaded_picture)
-                    payload["profile_picture"] = base64.b64encode(compressed_image).decode("utf-8")
-                    st.session_state.profile_picture = payload["profile_picture"]
-
-                response = post_api("update_profile", payload)
-
-                if response.get("status") == "success":
-                    st.success("✅ Profile updated successfully!")
-                    st.session_state.username = new_display_name
-                    st.session_state.bio = bio
-                    sleep(1)
-                    st.rerun()
-                else:
-                    st.error(f"❌ Failed to update profile: {response.get('message')}")
-
-        st.markdown("---")
-        col1, col2, col3 = st.columns([2, 1, 2])
-        with col1:
-            with stylable_container("logout_button", css_styles=purple_button_style):
-                if st.button("Logout"):
-                    cookies.pop("token", None)
-                    cookies.pop("username", None)
-                    cookies.pop("expiry", None)
-                    cookies.save()
-                    st.session_state.clear()
-                    st.rerun()
+    if st.session_state.token:
+        _render_logged_in()
     else:
-        if st.session_state.auth_mode == "login":
-            col1, col2, col3 = st.columns([1, 2, 1])
-            with col2:
-                st.title("Login")
-                with stylable_container("switch_to_register", css_styles=purple_button_style):
-                    if st.button("Don't have an account? Register here"):
-                        st.session_state.auth_mode = "register"
-                        st.rerun()
-        else:
-            col1, col2, col3 = st.columns([1, 2, 1])
-            with col2:
-                st.title("Sign up")
-                with stylable_container("switch_to_login", css_styles=purple_button_style):
-                    if st.button("Already have an account? Log in here"):
-                        st.session_state.auth_mode = "login"
-                        st.rerun()
-
-        if st.session_state.auth_mode == "login":
-            col1, col2, col3 = st.columns([1, 2, 1])
-            with col2:
-                with st.form("login_form"):
-                    username_or_email = st.text_input("Username or Email")
-                    password = st.text_input("Password", type="password")
-                    with stylable_container("remember_me", css_styles=remember_checkbox_style):
-                        remember = st.checkbox("Remember Me?", value=False)
-                    with stylable_container("login_button", css_styles=purple_button_style):
-                        submitted = st.form_submit_button("Login")
-
-                    if submitted:
-                        data = post_api("login", {
-                            "username_or_email": username_or_email,
-                            "password": password,
-                            "remember_me": remember
-                        })
-
-                        if data.get("status") == "success":
-                            st.session_state.token = data["token"]
-                            st.session_state.username = data["username"]
-                            st.session_state.bio = data.get("bio", "")
-                            st.session_state.profile_picture = data.get("profile_picture", "")
-                            st.success("✅ Logged in successfully!")
-
-                            if remember:
-                                expiry_time = datetime.now(timezone.utc) + timedelta(hours=24)
-                                cookies["token"] = data["token"]
-                                cookies["username"] = data["username"]
-                                cookies["bio"] = data.get("bio", "")
-                                cookies["profile_picture"] = data.get("profile_picture", "")
-                                cookies["expiry"] = expiry_time.isoformat()
-                                cookies.save()
-
-                            st.rerun()
-                        else:
-                            st.error(data.get("message"))
-
-                with stylable_container("reset_pass", css_styles=hover_text_purple):
-                    with st.expander("Reset your password"):
-                        handle_password_reset()
-
-        elif st.session_state.auth_mode == "register":
-            col1, col2, col3 = st.columns([1, 2, 1])
-            with col2:
-                with st.form("register_form"):
-                    email = st.text_input("Email")
-                    username = st.text_input("Username")
-                    password = st.text_input("Password", type="password")
-                    confirm_password = st.text_input("Confirm Password", type="password")
-                    with stylable_container("register_button", css_styles=purple_button_style):
-                        submitted = st.form_submit_button("Register")
-
-                    if submitted:
-                        if password != confirm_password:
-                            st.warning("Passwords do not match")
-                        else:
-                            data = post_api("register", {
-                                "email": email,
-                                "username": username,
-                                "password": password
-                            })
-                            if data.get("status") == "success":
-                                st.success("✅ Registered successfully. Please log in!")
-                                st.session_state.auth_mode = "login"
-                                st.rerun()
-                            else:
-                                st.error(data.get("message"))
+        _AUTH_VIEWS[st.session_state.auth_mode]()
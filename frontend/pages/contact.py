@@ -2,14 +2,14 @@ import streamlit as st
 import re
 import requests
 import time
-from streamlit_extras.stylable_container import stylable_container
-from frontend.styles import purple_button_style
+from frontend._http import SESSION
+from frontend.styles import primary_button_sheet
 
 API_ENDPOINT = "http://localhost:5000/contact"
+_EMAIL_RE = re.compile(r"^[\w\.-]+@[\w\.-]+\.\w+$")
 
 def is_valid_email(email):
-    pattern = r"^[\w\.-]+@[\w\.-]+\.\w+$"
-    return re.match(pattern, email) is not None
+    return _EMAIL_RE.match(email) is not None
 
 @st.dialog("📬 Contact Us")
 def show_contact_form():
@@ -19,33 +19,36 @@ def show_contact_form():
     last_name = st.text_input("Last Name")
     email = st.text_input("Email")
     message = st.text_area("Message (minimum 50 characters)")
-    with stylable_container("upload_button", css_styles=purple_button_style):
-        if st.button("Submit"):
-            if not first_name or not last_name or not email or not message:
-                st.warning("Please fill in all fields.")
-            elif not is_valid_email(email):
-                st.warning("Please enter a valid email address.")
-            elif len(message.strip()) < 50:
-                st.warning("Your message must be at least 50 characters long.")
-            else:
-                payload = {
-                    "first_name": first_name,
-                    "last_name": last_name,
-                    "email": email,
-                    "message": message
-                }
+    if st.button("Submit", type="primary"):
+        if not first_name or not last_name or not email or not message:
+            st.warning("Please fill in all fields.")
+        elif len(message.strip()) < 50:
+            st.warning("Your message must be at least 50 characters long.")
+        elif not is_valid_email(email):
+            st.warning("Please enter a valid email address.")
+        else:
+            payload = {
+                "first_name": first_name,
+                "last_name": last_name,
+                "email": email,
+                "message": message
+            }
 
-                try:
-                    response = requests.post(API_ENDPOINT, json=payload)
-                    result = response.json()
-                    if result.get("status") == "success":
-                        st.success("✅ Thank you! Your message has been sent successfully.")
-                        time.sleep(1.5)
-                        st.rerun()
-                    else:
-                        st.error(f"❌ Failed: {result.get('message')}")
-                except Exception as e:
-                    st.error(f"❌ An error occurred while sending your message: {e}")
+            try:
+                response = SESSION.post(API_ENDPOINT, json=payload, timeout=(3, 30))
+                response.raise_for_status()
+                result = response.json()
+                if result.get("status") == "success":
+                    st.toast("✅ Thank you! Your message has been sent successfully.", icon="📬")
+                    st.rerun()
+                else:
+                    st.error(f"❌ Failed: {result.get('message')}")
+            except requests.exceptions.Timeout:
+                st.error("❌ The server took too long to respond. Please try again.")
+            except requests.exceptions.HTTPError as e:
+                st.error(f"❌ The server returned an error ({e.response.status_code}). Please try again later.")
+            except Exception as e:
+                st.error(f"❌ An error occurred while sending your message: {e}")
 
 def show_contact():
     if "token" not in st.session_state or not st.session_state["token"]:
@@ -53,16 +56,25 @@ def show_contact():
         st.stop()
     if not st.session_state.get("backend_available", False):
         st.warning("⚠️ Contact form requires connection to the backend server, which is currently unavailable.")
-        if st.button("Retry Connection"):
+        # Rate-limit probes so repeated Retry clicks don't hammer the backend
+        now = time.monotonic()
+        if st.button("Retry Connection") and now - st.session_state.get("_last_health_check", 0) > 2.0:
+            st.session_state["_last_health_check"] = now
+            # HEAD skips the response body; Flask answers it for any GET route
             try:
-                requests.get("http://localhost:5000/", timeout=0.5)
+                res = SESSION.head("http://localhost:5000/", timeout=0.3, allow_redirects=False)
+                available = res.status_code < 500
+            except requests.exceptions.RequestException:
+                available = False
+            if available:
                 st.session_state.backend_available = True
                 st.rerun()
-            except:
+            else:
                 st.error("Still unable to connect to backend server")
         return
 
 
+    st.html(primary_button_sheet)
     col1,col2,col3 = st.columns([0.25,0.5,0.25])
     with col2:
         st.markdown("<h1 style='text-align: center;'>Contact</h1>", unsafe_allow_html=True)
@@ -77,6 +89,5 @@ def show_contact():
 
     col1, col2, col3 = st.columns([0.45,0.1,0.45])
     with col2:
-        with stylable_container(key="contact_button", css_styles=purple_button_style):
-            if st.button("Contact Us", use_container_width=True):
-                show_contact_form()
\ No newline at end of file
+        if st.button("Contact Us", use_container_width=True, type="primary"):
+            show_contact_form()
\ No newline at end of file
@@ -1,88 +1,186 @@
 import streamlit as st
 import requests
 import time
-from PIL import Image
+import hashlib
+import orjson
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from io import BytesIO
+from PIL import Image, ImageOps, UnidentifiedImageError
 from streamlit_extras.add_vertical_space import add_vertical_space
-from streamlit_extras.stylable_container import stylable_container
-from frontend.styles import purple_button_style, radio_button_style, hover_text_purple
-from streamlit_folium import st_folium
-import folium
-from geopy.geocoders import Nominatim
+from frontend.styles import (
+    purple_button_style, primary_button_style, radio_button_style, hover_text_purple,
+    ai_analysis_overlay_css, scoped_style,
+)
+from frontend._http import SESSION
+
+# Session keys dropped after a report is filed
+_REPORT_DIALOG_KEYS = ('show_report_dialog', 'selected_location', 'address_future', 'details', 'dialog_open')
+_DETECTION_KEYS = (
+    'report_submitted', 'show_report_button',
+    'uploaded_meta', 'original_image_bytes',
+    'model_results', 'evaluation_result', 'feedback_correct', 'feedback_comments', 'last_analyze_key'
+)
+
+
+_TITLE_HTML = """
+<div style="text-align: center;">
+    <h1 style="margin-bottom: 0;">AI Urban Problem Detector</h1>
+    <p style="font-size: 1.2rem; color: gray;">Analyze street images and automatically detect urban issues.</p>
+</div>
+"""
+
+# The overlay rules travel with the overlay, so ordinary reruns don't resend them
+_OVERLAY_HTML = f"""
+<style>{ai_analysis_overlay_css}</style>
+<div class="ai-analysis-overlay">
+    <div class="rotating-screw">
+        <svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24" fill="white">
+            <path d="M12,1L8,5H11V14H13V5H16M18,23H6V19H18V23M15,15H9L6,18H18L15,15Z" />
+        </svg>
+    </div>
+    <div class="ai-text">AI is analyzing your image...</div>
+</div>
+"""
+
+
+# Page stylesheet and title go out as a single markdown element, assembled once at import
+_DETECTION_HEADER = (
+    "<style>"
+    + primary_button_style
+    + scoped_style("upload_button", purple_button_style)
+    + scoped_style("hover_feedback", hover_text_purple)
+    + scoped_style("feedback_radio_btn", radio_button_style)
+    + "</style>"
+    + _TITLE_HTML
+)
 
 
 # --- Helpers ---
-def send_report_to_backend(location, details, evaluation, uploaded_file, max_retries=3):
-    retry_delay = 2  # Start with a 2-second delay
-    attempt = 0
+def send_report_to_backend(location, details, evaluation, name, mime, img_bytes):
+    # Nothing to attach; don't send a request the backend can only reject
+    if not img_bytes:
+        return {"status": "error", "message": "No image to attach to the report. Please analyze an image first."}
+
+    files = {
+        "image": (name, img_bytes, mime)
+    }
+    data = {
+        "location": location,
+        "details": details,
+        "evaluation": evaluation,  # Include AI evaluation output here
+        "username": st.session_state.get("username", "anonymous")
+    }
+
+    # One attempt only: the shared session already retries failed connects, and re-posting once the
+    # server has seen the request could email the same report twice
+    try:
+        response = SESSION.post("http://localhost:5000/send_email", data=data, files=files, timeout=(3, 30))
+    except requests.exceptions.RequestException as e:
+        return {"status": "error", "message": f"Could not reach the server: {e}"}
 
-    while attempt < max_retries:
+    if response.status_code == 200:
         try:
-            files = {
-                "image": (uploaded_file.name, uploaded_file.getvalue(), uploaded_file.type)
-            }
-            data = {
-                "location": location,
-                "details": details,
-                "evaluation": evaluation,  # Include AI evaluation output here
-                "username": st.session_state.get("username", "anonymous")
-            }
-            response = requests.post("http://localhost:5000/send_email", data=data, files=files, timeout=10)
-
-            # Check for successful response
-            if response.status_code == 200:
-                return response.json()
-            else:
-                st.error(f"❌ Report submission failed: {response.text}")
-
-        except Exception as e:
-            st.error(f"❌ An error occurred: {e}")
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            return {"status": "error", "message": "Report submission failed: the server sent an unreadable response."}
+    return {"status": "error", "message": f"Report submission failed: {response.text}"}
 
-        # Retry logic
-        attempt += 1
-        if attempt < max_retries:
-            st.warning(f"⚠️ Attempt {attempt} failed. Retrying in {retry_delay} seconds...")
-            time.sleep(retry_delay)
-            retry_delay *= 2  # Exponential backoff
 
-    return {"status": "error", "message": "Failed to send report after multiple attempts."}
+NOMINATIM_REVERSE_URL = "https://nominatim.openstreetmap.org/reverse"
 
 
-def load_lottie_url(url: str):
-    r = requests.get(url)
-    if r.status_code != 200:
-        return None
-    return r.json()
+# Background pool for blocking lookups that shouldn't hold up the script thread
+_IO_POOL = ThreadPoolExecutor(max_workers=4)
 
 
+@st.cache_data(ttl=86400, max_entries=1024, show_spinner=False)
 def get_address_from_coordinates(lat, lon):
-    try:
-        geolocator = Nominatim(user_agent="TownSense")
-        location = geolocator.reverse((lat, lon), language='en')
-        return location.address
-    except Exception:
-        return None
-
+    # Plain REST call over the pooled session instead of geopy's own HTTP stack.
+    # Failures raise so a timeout or rate-limit isn't cached for the spot; callers handle them.
+    response = SESSION.get(
+        NOMINATIM_REVERSE_URL,
+        params={"lat": lat, "lon": lon, "format": "json", "accept-language": "en"},
+        headers={"User-Agent": "TownSense"},
+        timeout=(3, 5)
+    )
+    response.raise_for_status()
+    return orjson.loads(response.content).get("display_name")
+
+# Circuit breaker for /analyze: after repeated failures, fail fast instead of making every user wait out the timeout
+BREAKER_FAIL_MAX = 5
+BREAKER_RESET_SECONDS = 30
+_breaker = {"failures": 0, "open_until": 0.0}
+_breaker_lock = Lock()
+
+
+def _analysis_breaker_open():
+    with _breaker_lock:
+        return time.monotonic() < _breaker["open_until"]
+
+
+def _record_analysis_result(ok):
+    with _breaker_lock:
+        if ok:
+            _breaker["failures"] = 0
+            return
+        _breaker["failures"] += 1
+        if _breaker["failures"] >= BREAKER_FAIL_MAX:
+            _breaker["open_until"] = time.monotonic() + BREAKER_RESET_SECONDS
+            _breaker["failures"] = 0
+
+
+def _is_backend_failure(exc):
+    # Client errors (bad image etc.) say nothing about the backend's health
+    if isinstance(exc, requests.exceptions.HTTPError):
+        return exc.response is not None and exc.response.status_code >= 500
+    return True
+
+
+# Matches the backend's resize_image limit, so downscaling here loses nothing the models would see
+MAX_UPLOAD_EDGE = 1280
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _prepare_payload(image_key, _img_bytes, name, mime):
+    """Shrink large photos to MAX_UPLOAD_EDGE and re-encode as JPEG before sending them for analysis."""
+    img = Image.open(BytesIO(_img_bytes))
+    if max(img.size) <= MAX_UPLOAD_EDGE:
+        return _img_bytes, name, mime
+    # Re-encoding drops the EXIF Orientation tag, so bake the rotation into the pixels first
+    img = ImageOps.exif_transpose(img).convert("RGB")
+    img.thumbnail((MAX_UPLOAD_EDGE, MAX_UPLOAD_EDGE), Image.LANCZOS)
+    buffer = BytesIO()
+    img.save(buffer, format="JPEG", quality=85, optimize=True)
+    return buffer.getvalue(), name.rsplit(".", 1)[0] + ".jpg", "image/jpeg"
+
+
+# Identical uploads within the TTL reuse the previous analysis instead of re-running the models.
+# Keyed on the upload's digest; the underscore keeps Streamlit from re-hashing the image bytes.
+@st.cache_data(ttl=600, max_entries=64, show_spinner=False)
+def _run_analysis(image_key, _img_bytes, name, mime):
+    # Detection and AI evaluation happen in one backend round-trip
+    response = SESSION.post(
+        "http://localhost:5000/analyze", files={"image": (name, _img_bytes, mime)}, timeout=(3, 75)
+    )
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+@st.cache_resource
+def _base_map():
+    import folium
 
-def send_to_evaluation(detections, base64_image=None):
-    try:
-        payload = {"detections": detections}
-        if base64_image:
-            payload["image"] = base64_image
-
-        response = requests.post("http://localhost:5000/evaluate", json=payload, timeout=45)  # Increased timeout
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.Timeout:
-        return {
-            "status": "error",
-            "message": "AI evaluation timed out. The server is processing your request but it's taking longer than expected."
-        }
-    except Exception as e:
-        return {"status": "error", "message": str(e)}
+    m = folium.Map(location=[45.9432, 24.9668], zoom_start=6)
+    m.add_child(folium.LatLngPopup())
+    return m
 
 
 @st.dialog("Report form")
-def display_report_form(uploaded_file):
+def display_report_form():
+    # Map widgets are only needed once the report dialog opens
+    from streamlit_folium import st_folium
+
     st.markdown("### 📝 Report a problem to the authorities")
 
     # Initialize dialog state
@@ -91,226 +189,98 @@ def display_report_form(uploaded_file):
     # Ensure dialog doesn't affect main UI display
     st.session_state.setdefault("dialog_open", True)
 
-    # Map input
+    # Map input - once a location is picked the map is swapped for a summary, so later reruns skip it
     st.markdown("#### 📍 Select a location on the map")
-    m = folium.Map(location=[45.9432, 24.9668], zoom_start=6)
-    m.add_child(folium.LatLngPopup())
-    map_data = st_folium(m, width=700, height=500)
-    if map_data and map_data.get('last_clicked'):
-        lat, lon = map_data['last_clicked']['lat'], map_data['last_clicked']['lng']
-        st.session_state.selected_location = (lat, lon)
-        address = get_address_from_coordinates(lat, lon)
-        if address:
-            st.session_state.address = address
-            st.success(f"Selected Address: {address}")
+    if st.session_state.selected_location is None:
+        map_data = st_folium(
+            _base_map(), width=700, height=500, key="report_map", returned_objects=["last_clicked"]
+        )
+        if map_data and map_data.get('last_clicked'):
+            # ~1 m precision; nearby clicks on the same spot hit the geocode cache
+            lat = round(map_data['last_clicked']['lat'], 5)
+            lon = round(map_data['last_clicked']['lng'], 5)
+            st.session_state.selected_location = (lat, lon)
+            # Geocode in the background while the user fills in the details
+            st.session_state.address_future = _IO_POOL.submit(get_address_from_coordinates, lat, lon)
+            st.rerun(scope="fragment")
+    else:
+        address_future = st.session_state.address_future
+        if not address_future.done():
+            st.info("📍 Looking up the address for the selected location...")
+        elif address_future.exception() is None and address_future.result():
+            st.success(f"Selected Address: {address_future.result()}")
         else:
             st.warning("Unable to retrieve address.")
+        if st.button("🗺️ Change location"):
+            st.session_state.selected_location = None
+            st.session_state.pop("address_future", None)
+            st.rerun(scope="fragment")
 
     # Details input
     st.markdown("#### 🧾 Problem Details (minimum 20 characters)")
-    st.session_state.details = st.text_area("", value=st.session_state.details, key="details_input")
-
-    # Submit
-    with stylable_container("submit_report", css_styles=purple_button_style):
-        if st.button("📤 Submit Report"):
-            if not st.session_state.selected_location:
-                st.warning("Please select a location on the map.")
-                return
-            if len(st.session_state.details.strip()) < 20:
-                st.warning("Please provide at least 20 characters for the details.")
-                return
-            with st.spinner("🚀 Submitting your report..."):
-                result = send_report_to_backend(
-                    st.session_state.address,
-                    st.session_state.details,
-                    st.session_state.evaluation_result.get("evaluation", "No evaluation provided."),
-                    uploaded_file
-                )
-                if result.get("status") == "success":
-                    st.success("✅ Report submitted successfully!")
-                    st.balloons()
-                    # Clear report dialog state but keep detection state
-                    for key in [
-                        'show_report_dialog', 'selected_location', 'address', 'details', 'dialog_open'
-                    ]:
-                        st.session_state.pop(key, None)
-
-                    st.session_state['report_submitted'] = True
-
-                    # Add a delay before clearing everything
-                    time.sleep(2)
-
-                    st.rerun()
-                else:
-                    st.error(f"❌ Error: {result.get('message')}")
-
-
-# CSS for the loading effect during AI analysis
-ai_analysis_overlay_css = """
-.ai-analysis-overlay {
-    position: fixed;
-    top: 0;
-    left: 0;
-    width: 100%;
-    height: 100%;
-    backdrop-filter: blur(8px);
-    -webkit-backdrop-filter: blur(8px);
-    display: flex;
-    flex-direction: column;
-    justify-content: center;
-    align-items: center;
-    z-index: 1000;
-    background-color: rgba(0, 0, 0, 0.5);
-}
-
-.rotating-screw {
-    width: 100px;
-    height: 100px;
-    animation: rotate 2s linear infinite;
-}
-
-@keyframes rotate {
-    from { transform: rotate(0deg); }
-    to { transform: rotate(360deg); }
-}
-
-.ai-text {
-    color: white;
-    font-size: 24px;
-    margin-top: 20px;
-    text-shadow: 0px 0px 10px rgba(119, 92, 255, 1);
-}
-"""
-
-
-# --- Page ---
-def show_detection():
-    if "token" not in st.session_state or not st.session_state["token"]:
-        st.error("🔒 Please log in to access this page.")
-        st.stop()
-
-    st.markdown(f"<style>{ai_analysis_overlay_css}</style>", unsafe_allow_html=True)
-
-    st.markdown("""
-    <div style="text-align: center;">
-        <h1 style="margin-bottom: 0;">AI Urban Problem Detector</h1>
-        <p style="font-size: 1.2rem; color: gray;">Analyze street images and automatically detect urban issues.</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-    add_vertical_space(3)
-
-    # Check if we need to clear state due to successful report submission
-    if st.session_state.get('report_submitted'):
-        # Clear relevant detection state after successful submission
-        for key in [
-            'report_submitted', 'show_report_button',
-            'uploaded_file', 'original_image_bytes', 'annotated_image_b64',
-            'model_results', 'evaluation_result', 'feedback_correct', 'feedback_comments'
-        ]:
-            st.session_state.pop(key, None)
-
-    # File upload form - always show this
-    with st.container():
-        st.markdown("### Upload an Image")
-        st.markdown("Select a photo showing a street, road, or urban area to start detection.")
-
-        with st.form("upload_form", clear_on_submit=True):
-            with stylable_container("upload_button", css_styles=purple_button_style):
-                uploaded_file = st.file_uploader("Choose a file", type=["jpg", "jpeg", "png"])
-            add_vertical_space(1)
-            with stylable_container("analyze_button", css_styles=purple_button_style):
-                submitted = st.form_submit_button("Analyze")
-
-        if submitted and uploaded_file:
-            st.success("✅ Image uploaded successfully.")
-            # Store uploaded file in session state for persistence
-            st.session_state['uploaded_file'] = uploaded_file
-
-            # Process the image
-            results_container = st.container()
-            
-            # Create the overlay container for the loading effect
-            overlay_placeholder = st.empty()
-
-            # Show loading overlay
-            with overlay_placeholder:
-                st.markdown("""
-                <div class="ai-analysis-overlay">
-                    <div class="rotating-screw">
-                        <svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24" fill="white">
-                            <path d="M12,1L8,5H11V14H13V5H16M18,23H6V19H18V23M15,15H9L6,18H18L15,15Z" />
-                        </svg>
-                    </div>
-                    <div class="ai-text">AI is analyzing your image...</div>
-                </div>
-                """, unsafe_allow_html=True)
-
-            with st.spinner("Analyzing image with AI models..."):
-                try:
-                    # Reset file pointer to beginning
-                    uploaded_file.seek(0)
-
-                    files = {
-                        "image": (uploaded_file.name, uploaded_file.getvalue(), uploaded_file.type)
-                    }
-                    response = requests.post("http://localhost:5000/upload", files=files, timeout=30)
-                    response.raise_for_status()
-                    data = response.json()
-                    model_results = data.get("detected_objects", {})
-
-                    st.session_state['model_results'] = model_results
-                    eval_result = send_to_evaluation(model_results, data.get('image'))
-                    overlay_placeholder.empty()
-
-                    # Store evaluation results in session state
-                    st.session_state['evaluation_result'] = eval_result
-                    # Enable showing the report button
-                    st.session_state['show_report_button'] = True
-
-                except requests.exceptions.RequestException as e:
-                    # Clear the overlay on error
-                    overlay_placeholder.empty()
-                    st.error(f"❌ Detection failed: {e}")
-
-        elif submitted:
-            st.warning("⚠️ Please upload an image to proceed.")
-
-    # Always display the image and AI evaluation if they exist in session state
-    # even if dialog is open
-    if st.session_state.get('uploaded_file'):
-        # Display the image that was uploaded
-        img = Image.open(st.session_state['uploaded_file'])
-        col1, col2, col3 = st.columns([1, 3, 1])
-        with col2:
-            st.image(img, use_container_width=True)
-
-        # Display AI evaluation if it exists
-        if st.session_state.get('evaluation_result'):
-            eval_result = st.session_state['evaluation_result']
-            st.header("AI Evaluation")
-            if eval_result.get("status") != "error" and "evaluation" in eval_result:
-                with st.container(height=400, border=True):
-                    st.markdown(eval_result["evaluation"], unsafe_allow_html=True)
-
-                if "note" in eval_result:
-                    st.info(eval_result["note"])
+    # Batch the details and submit in a form so typing doesn't rerun the dialog
+    with st.form("report_form", border=False):
+        st.session_state.details = st.text_area("", value=st.session_state.details, key="details_input")
+
+        # Submit
+        submitted = st.form_submit_button("📤 Submit Report", type="primary")
+
+    if submitted:
+        if not st.session_state.selected_location:
+            st.warning("Please select a location on the map.")
+            return
+        if len(st.session_state.details.strip()) < 20:
+            st.warning("Please provide at least 20 characters for the details.")
+            return
+        if not st.session_state.get('original_image_bytes') or not st.session_state.get('last_analyze_key'):
+            st.warning("The analysed image is no longer available. Please upload it again.")
+            return
+        with st.spinner("🚀 Submitting your report..."):
+            try:
+                address = st.session_state.address_future.result(timeout=5)
+            except (FutureTimeout, requests.exceptions.RequestException, orjson.JSONDecodeError):
+                address = None
+            lat, lon = st.session_state.selected_location
+            # The city gets the original upload, not the downscaled copy made for the models
+            result = send_report_to_backend(
+                address or f"{lat}, {lon}",
+                st.session_state.details,
+                st.session_state.evaluation_result.get("evaluation", "No evaluation provided."),
+                st.session_state['uploaded_meta']['name'],
+                st.session_state['uploaded_meta']['type'],
+                st.session_state['original_image_bytes']
+            )
+            if result.get("status") == "success":
+                st.success("✅ Report submitted successfully!")
+                st.balloons()
+                # Clear report dialog state but keep detection state
+                for key in _REPORT_DIALOG_KEYS:
+                    st.session_state.pop(key, None)
+
+                st.session_state['report_submitted'] = True
+
+                # Add a delay before clearing everything
+                time.sleep(2)
+
+                st.rerun()
             else:
-                st.warning(f"⚠️ Could not get AI evaluation: {eval_result.get('message', 'Unknown error')}")
+                st.error(f"❌ Error: {result.get('message')}")
 
-    add_vertical_space(3)
 
-    # Show report button if needed
-    if st.session_state.get('show_report_button') and st.session_state.get('uploaded_file'):
+# Widget events in these sections only rerun the section, not the whole detection page
+@st.fragment
+def _report_section():
+    if st.session_state.get('show_report_button') and st.session_state.get('uploaded_meta'):
         col1, col2, col3 = st.columns([0.45, 0.1, 0.45])
         with col2:
-            with stylable_container(key="report_button", css_styles=purple_button_style):
-                if st.button("Send Report", use_container_width=True):
-                    # Set dialog_open flag to preserve state during dialog
-                    st.session_state['dialog_open'] = True
-                    display_report_form(st.session_state['uploaded_file'])
+            if st.button("Send Report", use_container_width=True, type="primary"):
+                # Set dialog_open flag to preserve state during dialog
+                st.session_state['dialog_open'] = True
+                display_report_form()
 
-    # Feedback form
+
+@st.fragment
+def _feedback_section():
     if "feedback_comments" not in st.session_state:
         st.session_state.feedback_comments = ""
 
@@ -325,11 +295,11 @@ def show_detection():
 
     col1, col2, col3 = st.columns([0.25, 0.5, 0.25])
     with col2:
-        if st.session_state.get('uploaded_file') and st.session_state.get('model_results'):
+        if st.session_state.get('uploaded_meta') and st.session_state.get('model_results'):
             st.markdown("### 📝 Feedback on AI Detection")
             st.markdown("Help us improve by providing feedback on the AI's performance.")
 
-            with stylable_container(key="hover_feedback", css_styles=hover_text_purple):
+            with st.container(key="hover_feedback"):
                 with st.expander("What does your feedback help with?", expanded=False):
                     st.markdown("""
                     Your feedback directly helps our AI models learn and improve:
@@ -340,7 +310,7 @@ def show_detection():
 
             # Use a form for controlled submission
             with st.form(key="feedback_form"):
-                with stylable_container(key="feedback_radio_btn", css_styles=radio_button_style):
+                with st.container(key="feedback_radio_btn"):
                     feedback_correct = st.radio(
                         "Did the AI detect the issues correctly?",
                         options=["Yes", "No"],
@@ -355,8 +325,7 @@ def show_detection():
                 )
 
                 # Submit button
-                with stylable_container("feedback_button", css_styles=purple_button_style):
-                    submit_feedback = st.form_submit_button("Submit Feedback")
+                submit_feedback = st.form_submit_button("Submit Feedback", type="primary")
 
             # Form submission logic
             if submit_feedback:
@@ -369,10 +338,11 @@ def show_detection():
                     }
 
                     try:
-                        response = requests.post(
+                        response = SESSION.post(
                             "http://localhost:5000/submit_feedback",
-                            json=feedback_data,
-                            timeout=10
+                            data=orjson.dumps(feedback_data),
+                            headers={"Content-Type": "application/json"},
+                            timeout=(3, 10)
                         )
 
                         if response.status_code == 200:
@@ -388,5 +358,127 @@ def show_detection():
 
                     except Exception as e:
                         st.error(f"❌ Error: {str(e)}")
+
+
+# --- Page ---
+def show_detection():
+    if "token" not in st.session_state or not st.session_state["token"]:
+        st.error("🔒 Please log in to access this page.")
+        st.stop()
+
+    st.markdown(_DETECTION_HEADER, unsafe_allow_html=True)
+
+    add_vertical_space(3)
+
+    # Check if we need to clear state due to successful report submission
+    if st.session_state.get('report_submitted'):
+        # Clear relevant detection state after successful submission
+        for key in _DETECTION_KEYS:
+            st.session_state.pop(key, None)
+
+    # File upload form - always show this
+    with st.container():
+        st.markdown("### Upload an Image")
+        st.markdown("Select a photo showing a street, road, or urban area to start detection.")
+
+        with st.form("upload_form", clear_on_submit=True):
+            with st.container(key="upload_button"):
+                uploaded_file = st.file_uploader("Choose a file", type=["jpg", "jpeg", "png"])
+            add_vertical_space(1)
+            submitted = st.form_submit_button("Analyze", type="primary")
+
+        if submitted and uploaded_file:
+            st.success("✅ Image uploaded successfully.")
+            # Keep only what later steps need; the UploadedFile itself isn't stored
+            uploaded_meta = {'name': uploaded_file.name, 'type': uploaded_file.type}
+            img_bytes = uploaded_file.getvalue()
+
+            # Re-submitting the image already on screen reuses its results instead of re-analysing
+            image_key = hashlib.blake2b(img_bytes, digest_size=16).hexdigest()
+            if _analysis_breaker_open():
+                st.error("⚠️ The analysis service is temporarily unavailable. Please try again in a moment.")
+            elif image_key != st.session_state.get('last_analyze_key') or not st.session_state.get('evaluation_result'):
+                # Create the overlay container for the loading effect
+                overlay_placeholder = st.empty()
+
+                # Show loading overlay
+                with overlay_placeholder:
+                    st.markdown(_OVERLAY_HTML, unsafe_allow_html=True)
+
+                with st.spinner("Analyzing image with AI models..."):
+                    try:
+                        # Downscaling decodes the upload, so an unreadable file fails here rather than in the backend
+                        payload = _prepare_payload(image_key, img_bytes, uploaded_meta['name'], uploaded_meta['type'])
+                        data = _run_analysis(image_key, *payload)
+                        _record_analysis_result(True)
+                        model_results = data.get("detected_objects", {})
+
+                        st.session_state['model_results'] = model_results
+                        eval_result = data.get("evaluation_result", {})
+                        overlay_placeholder.empty()
+
+                        # Store evaluation results in session state
+                        st.session_state['evaluation_result'] = eval_result
+                        # Enable showing the report button
+                        st.session_state['show_report_button'] = True
+                        # The image, its metadata and its key only replace the previous ones together, once the
+                        # analysis succeeded, so a report always pairs the image with its own evaluation
+                        st.session_state['uploaded_meta'] = uploaded_meta
+                        st.session_state['original_image_bytes'] = img_bytes
+                        st.session_state['last_analyze_key'] = image_key
+
+                    except requests.exceptions.Timeout:
+                        _record_analysis_result(False)
+                        overlay_placeholder.empty()
+                        st.error("❌ AI analysis timed out. The server is taking longer than expected, please try again.")
+                    except requests.exceptions.RequestException as e:
+                        _record_analysis_result(not _is_backend_failure(e))
+                        # Clear the overlay on error
+                        overlay_placeholder.empty()
+                        st.error(f"❌ Detection failed: {e}")
+                    except orjson.JSONDecodeError:
+                        # A 200 that isn't JSON means the backend is misbehaving, not the upload
+                        _record_analysis_result(False)
+                        overlay_placeholder.empty()
+                        st.error("❌ Detection failed: the server sent an unreadable response.")
+                    except (UnidentifiedImageError, OSError):
+                        # Listed after RequestException, which is also an OSError. An unreadable upload is a client
+                        # error, so the breaker treats it like the backend's 4xx for bad images
+                        _record_analysis_result(True)
+                        overlay_placeholder.empty()
+                        st.error("❌ Detection failed: the file could not be read as an image.")
+
+        elif submitted:
+            st.warning("⚠️ Please upload an image to proceed.")
+
+    # Always display the image and AI evaluation if they exist in session state
+    # even if dialog is open
+    if st.session_state.get('uploaded_meta'):
+        # Display the image that was uploaded
+        # st.image serves encoded bytes as-is, no PIL decode needed
+        col1, col2, col3 = st.columns([1, 3, 1])
+        with col2:
+            st.image(st.session_state['original_image_bytes'], use_container_width=True)
+
+        # Display AI evaluation if it exists
+        if st.session_state.get('evaluation_result'):
+            eval_result = st.session_state['evaluation_result']
+            st.header("AI Evaluation")
+            if eval_result.get("status") != "error" and "evaluation" in eval_result:
+                with st.container(height=400, border=True):
+                    st.markdown(eval_result["evaluation"], unsafe_allow_html=True)
+
+                if "note" in eval_result:
+                    st.info(eval_result["note"])
+            else:
+                st.warning(f"⚠️ Could not get AI evaluation: {eval_result.get('message', 'Unknown error')}")
+
+    add_vertical_space(3)
+
+    # Show report button if needed
+    _report_section()
+
+    # Feedback form
+    _feedback_section()
 #viespa
 
@@ -1,27 +1,38 @@
 import streamlit as st
-import requests
+import base64
 from datetime import datetime
 import pytz
 from streamlit_extras.add_vertical_space import add_vertical_space
-from streamlit_extras.stylable_container import stylable_container
-from frontend.styles import purple_button_style
+from frontend.styles import primary_button_sheet
+from frontend._http import SESSION
 
 # --- API Endpoints ---
 API_URL = "http://localhost:5000/get_reports"
 CLEAR_URL = "http://localhost:5000/clear_reports"
 
+RO_TZ = pytz.timezone("Europe/Bucharest")
+
+PAGE_SIZE = 10
+
+REPORT_CARD_TEXT = (
+    "**📍 Location:** {location}  \n"
+    "**📝 Details:** {details}  \n"
+    "**🕒 Time:** {timestamp}"
+)
+
 # --- Fetching Functions ---
-@st.cache_data(ttl=60)
-def fetch_user_reports(username):
+@st.cache_data(ttl=60, max_entries=32)
+def fetch_user_reports(username, page, page_size=PAGE_SIZE):
+    payload = {"username": username, "limit": page_size, "offset": page * page_size}
     try:
-        res = requests.post(API_URL, json={"username": username}, timeout=5)
+        res = SESSION.post(API_URL, json=payload, timeout=5)
         return res.json()
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 def clear_user_history(username):
     try:
-        res = requests.post(CLEAR_URL, json={"username": username}, timeout=5)
+        res = SESSION.post(CLEAR_URL, json={"username": username}, timeout=5)
         return res.json()
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -30,7 +41,7 @@ def clear_user_history(username):
 def format_timestamp_to_ro(timestamp):
     try:
         utc_time = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-        ro_time = utc_time.astimezone(pytz.timezone("Europe/Bucharest"))
+        ro_time = utc_time.astimezone(RO_TZ)
         return ro_time.strftime("%Y.%m.%d   %H:%M:%S")
     except Exception:
         return "Invalid time"
@@ -41,6 +52,7 @@ def show_history():
         st.error("🔒 Please log in to access this page.")
         st.stop()
 
+    st.html(primary_button_sheet)
     st.title("📖 Your Report History")
 
     add_vertical_space(2)
@@ -48,26 +60,27 @@ def show_history():
     # --- Buttons First ---
     col1, col2, col3 = st.columns([0.1,0.8,0.1])
     with col1:
-        with stylable_container("refresh_btn", css_styles=purple_button_style):
-            if st.button("🔄 Refresh", use_container_width=True):
-                st.cache_data.clear()
-                st.session_state["refresh_reports"] = True
-                st.rerun()
+        if st.button("🔄 Refresh", use_container_width=True, type="primary"):
+            fetch_user_reports.clear()
+            st.session_state["refresh_reports"] = True
+            st.rerun()
     with col3:
-        with stylable_container("clear_btn", css_styles=purple_button_style):
-            if st.button("Clear History", use_container_width=True):
-                result = clear_user_history(st.session_state["username"])
-                if result.get("status") == "success":
-                    with col2:
-                        st.success(f"✅ Cleared {result.get('deleted', 0)} report(s).")
-                    st.cache_data.clear()
-                    st.rerun()
-                else:
-                    st.error(f"❌ Failed to clear history: {result.get('message')}")
-                    st.stop()
+        if st.button("Clear History", use_container_width=True, type="primary"):
+            result = clear_user_history(st.session_state["username"])
+            if result.get("status") == "success":
+                with col2:
+                    st.success(f"✅ Cleared {result.get('deleted', 0)} report(s).")
+                fetch_user_reports.clear()
+                st.session_state["history_page"] = 1
+                st.rerun()
+            else:
+                st.error(f"❌ Failed to clear history: {result.get('message')}")
+                st.stop()
 
     # --- Fetch Reports (only after buttons) ---
-    data = fetch_user_reports(st.session_state["username"])
+    # Only the current page is fetched and rendered; the page picker sits below the list
+    page = st.session_state.get("history_page", 1)
+    data = fetch_user_reports(st.session_state["username"], page - 1)
 
     if data.get("status") != "success":
         st.error(f"Error: {data.get('message')}")
@@ -80,6 +93,14 @@ def show_history():
         st.write("Actual value of reports:", reports)
         return
 
+    total = data.get("total", len(reports))
+    total_pages = max((total + PAGE_SIZE - 1) // PAGE_SIZE, 1)
+
+    if not reports and page > total_pages:
+        # The list shrank under us (e.g. cleared elsewhere) - jump back to the last page
+        st.session_state["history_page"] = total_pages
+        st.rerun()
+
     if not reports:
         st.info("No reports yet. Start detecting urban problems!")
         return
@@ -88,25 +109,20 @@ def show_history():
     # --- Render Reports ---
     with col2:
         for r in reports:
-            image_b64 = r["image"]
             location = r["location"]
             details = r["details"]
             timestamp = format_timestamp_to_ro(r["timestamp"])
 
-            st.markdown(f"""
-            <div style="
-                background-color: #ffffff;
-                border: 1px solid #ccc;
-                border-radius: 10px;
-                padding: 16px;
-                margin-bottom: 20px;
-                box-shadow: 0 2px 8px rgba(0, 0, 0, 0.04);
-            ">
-                <img src="data:image/png;base64,{image_b64}" style="width: 100%; border-radius: 8px;" />
-                <div style="margin-top: 12px;">
-                    <strong>📍 Location:</strong> {location}<br>
-                    <strong>📝 Details:</strong> {details}<br>
-                    <strong>🕒 Time:</strong> {timestamp}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
\ No newline at end of file
+            # st.image serves the decoded bytes through Streamlit's media endpoint instead of inlining base64
+            with st.container(border=True):
+                st.image(base64.b64decode(r["image"]), use_container_width=True)
+                st.markdown(REPORT_CARD_TEXT.format(location=location, details=details, timestamp=timestamp))
+
+        if total_pages > 1:
+            st.number_input(
+                f"Page (of {total_pages})",
+                min_value=1,
+                max_value=total_pages,
+                step=1,
+                key="history_page",
+            )
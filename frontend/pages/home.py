@@ -1,29 +1,25 @@
 import streamlit as st
-import os
-import base64
+import re
 from streamlit_extras.add_vertical_space import add_vertical_space
 from streamlit.components.v1 import html
+from frontend._paths import ASSETS_DIR
 
 
-def show_home():
-    try:
-        webm_path = os.path.join(os.path.dirname(__file__), "..", "assets", "logo.webm")
-        with open(webm_path, "rb") as f:
-            base64_webm = base64.b64encode(f.read()).decode()
-
-        st.markdown(f"""
-            <div style="text-align: center;">
-                <video width="750" autoplay loop muted playsinline>
-                    <source src="data:video/webm;base64,{base64_webm}" type="video/webm">
-                    Your browser does not support the video tag.
-                </video>
-            </div>
-        """, unsafe_allow_html=True)
+_SCRIPT_RE = re.compile(r"(<script>.*?</script>)", re.S)
+_COMMENT_RE = re.compile(r"<!--.*?-->|/\*.*?\*/", re.S)
+_WS_RE = re.compile(r"\s+")
 
-    except FileNotFoundError:
-        st.error("🚫 Could not load homepage animation (logo.webm not found)")
 
-    html("""
+def _minify(markup):
+    """Strip comments and collapse whitespace outside <script> blocks (their // comments need the newlines)."""
+    parts = _SCRIPT_RE.split(markup)
+    for i in range(0, len(parts), 2):
+        parts[i] = _WS_RE.sub(" ", _COMMENT_RE.sub("", parts[i]))
+    return "".join(parts).strip()
+
+
+# Static page markup, built (and minified) once at import instead of on every rerun
+_HERO_HTML = _minify("""
     <style>
     .hero-text {
       text-align: center;
@@ -55,75 +51,63 @@ def show_home():
         Revolutionize how cities stay clean, safe, and efficient in a modern and fun way.
       </p>
     </div>
-    """, height=200)
-
-    assets_path = os.path.join(os.path.dirname(__file__), "..", "assets")
-
-    image1_path = os.path.join(assets_path, "urban1.png")
-    image2_path = os.path.join(assets_path, "urban2.png")
-    image3_path = os.path.join(assets_path, "urban3.png")
-
-    with open(image1_path, "rb") as img_file:
-        img1_base64 = base64.b64encode(img_file.read()).decode("utf-8")
+    """)
 
-    with open(image2_path, "rb") as img_file:
-        img2_base64 = base64.b64encode(img_file.read()).decode("utf-8")
-
-    with open(image3_path, "rb") as img_file:
-        img3_base64 = base64.b64encode(img_file.read()).decode("utf-8")
-
-    html(f"""
+# Scroller images come from Streamlit's static file server (frontend/static) so the browser caches them
+_SCROLLER_HTML = _minify("""
         <div style="width: 100%; overflow: hidden; padding: 10px 0; position: relative; background-color: #f5f5f5;">
-          <div class="scroll-container" style="
-              display: flex;
-              width: fit-content;
-              animation: scrollLoop 30s linear infinite;
-          ">
+          <!-- Fixed width (6 x (400px image + 30px margin)) and its own compositor layer, so frames don't re-measure the row -->
+          <div class="scroll-container" style="width: 2580px; will-change: transform;">
 
             <!-- First track of images -->
             <div style="display: flex;">
-              <img src="data:image/png;base64,{img1_base64}" style="width:400px; margin-right:30px; border-radius: 12px;" />
-              <img src="data:image/png;base64,{img2_base64}" style="width:400px; margin-right:30px; border-radius: 12px;" />
-              <img src="data:image/png;base64,{img3_base64}" style="width:400px; margin-right:30px; border-radius: 12px;" />
+              <img src="app/static/urban1.png" loading="lazy" decoding="async" style="width:400px; margin-right:30px; border-radius: 12px;" />
+              <img src="app/static/urban2.png" loading="lazy" decoding="async" style="width:400px; margin-right:30px; border-radius: 12px;" />
+              <img src="app/static/urban3.png" loading="lazy" decoding="async" style="width:400px; margin-right:30px; border-radius: 12px;" />
             </div>
 
             <!-- Duplicate track for seamless scrolling -->
             <div style="display: flex;">
-              <img src="data:image/png;base64,{img1_base64}" style="width:400px; margin-right:30px; border-radius: 12px;" />
-              <img src="data:image/png;base64,{img2_base64}" style="width:400px; margin-right:30px; border-radius: 12px;" />
-              <img src="data:image/png;base64,{img3_base64}" style="width:400px; margin-right:30px; border-radius: 12px;" />
+              <img src="app/static/urban1.png" loading="lazy" decoding="async" style="width:400px; margin-right:30px; border-radius: 12px;" />
+              <img src="app/static/urban2.png" loading="lazy" decoding="async" style="width:400px; margin-right:30px; border-radius: 12px;" />
+              <img src="app/static/urban3.png" loading="lazy" decoding="async" style="width:400px; margin-right:30px; border-radius: 12px;" />
             </div>
 
           </div>
         </div>
 
         <style>
-        @keyframes scrollLoop {{
-  0% {{ transform: translateX(0); }}
-  100% {{ transform: translateX(-50%); }}
-}}
-.scroll-container {{
+        @keyframes scrollLoop {
+  0% { transform: translate3d(0, 0, 0); }
+  100% { transform: translate3d(-50%, 0, 0); }
+}
+.scroll-container {
   display: flex;
   animation: scrollLoop 30s linear infinite;
-}}
+}
         </style>
-        """, height=300)
-
-    add_vertical_space(2)
-
-    st.header("Why TownSense?")
-
-    col1,col2,col3 = st.columns([1,3,1])
 
-    with col2:
+        <script>
+        // Only animate (and repaint) the scroller while it is on screen
+        const track = document.querySelector('.scroll-container');
+        new IntersectionObserver(entries => {
+            track.style.animationPlayState = entries[0].isIntersecting ? 'running' : 'paused';
+        }).observe(track);
+        </script>
+        """)
 
-        html("""
+# Feature grid and CTA share one iframe and one observer
+_FEATURES_HTML = _minify("""
         <style>
         .grid-container {
           display: grid;
           grid-template-columns: repeat(2, 1fr);
           gap: 30px;
-          margin-top: 40px;
+          /* Same width and footprint the grid had in its own [1, 3, 1] column iframe */
+          width: 60%;
+          min-height: 440px;
+          align-content: start;
+          margin: 40px auto 0;
           font-family: 'Trebuchet MS', sans-serif;
         }
     
@@ -136,8 +120,21 @@ def show_home():
           transform: translateY(30px);
           transition: opacity 0.8s ease 0.4s, transform 0.8s ease 0.4s;
         }
+
+        .cta-container {
+            background-color: #000000;
+            padding: 30px;
+            border-radius: 12px;
+            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+            margin-top: 30px;
+            text-align: center;
+            opacity: 0;
+            font-family: 'Trebuchet MS', sans-serif;
+            transform: translateY(30px);
+            transition: opacity 0.8s ease 0.3s, transform 0.8s ease 0.3s;
+        }
     
-        .grid-item.visible {
+        .grid-item.visible, .cta-container.visible {
           opacity: 1;
           transform: translateY(0);
         }
@@ -161,62 +158,56 @@ def show_home():
             <p>Users earn points for relevant reports. Help improve your city in real time.</p>
           </div>
         </div>
+
+        <div class="cta-container">
+            <h2 style="color: #ffffff;">Ready to experience the future of urban issue detection?</h2>
+            <p style="font-size: 18px; color: #ffffff;">
+                Upload images and let our AI detect urban issues instantly!
+            </p>
+        </div>
     
         <script>
-        const items = document.querySelectorAll('.grid-item');
         const observer = new IntersectionObserver(entries => {
             entries.forEach(entry => {
                 if (entry.isIntersecting) {
-                entry.target.classList.add('visible');
+                    entry.target.classList.add('visible');
+                    // Nothing left to do for this element once it has faded in
+                    observer.unobserve(entry.target);
                 }
             });
         }, { threshold: 0.1 });
     
-        items.forEach(item => observer.observe(item));
+        document.querySelectorAll('.grid-item, .cta-container').forEach(el => observer.observe(el));
         </script>
-        """, height=500)
+        """)
 
-    col1, col2, col3 = st.columns([1, 5, 1])
-    with col2:
-        html("""
-        <style>
-            .cta-container {
-            background-color: #000000;
-            padding: 30px;
-            border-radius: 12px;
-            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-            margin-top: 30px;
-            text-align: center;
-            opacity: 0;
-            font-family: 'Trebuchet MS', sans-serif;
-            transform: translateY(30px);
-            transition: opacity 0.8s ease 0.3s, transform 0.8s ease 0.3s;
-        }
+# Assets never change while the app runs; read each one once per process
+@st.cache_resource
+def _asset_bytes(filename):
+    return (ASSETS_DIR / filename).read_bytes()
 
-        .cta-container.visible {
-            opacity: 1;
-            transform: translateY(0);
-        }
-        </style>
 
-        <div class="cta-container">
-            <h2 style="color: #ffffff;">Ready to experience the future of urban issue detection?</h2>
-            <p style="font-size: 18px; color: #ffffff;">
-                Upload images and let our AI detect urban issues instantly!
-            </p>
-        </div>
+def show_home():
+    try:
+        # st.video serves the file from Streamlit's media endpoint, so the browser fetches and caches it
+        # instead of receiving ~400 KB of base64 inside the page markup on every rerun
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            st.video(_asset_bytes("logo.webm"), format="video/webm", autoplay=True, loop=True, muted=True)
 
-        <script>
-        const cta = document.querySelector('.cta-container');
-        const observerCTA = new IntersectionObserver(entries => {
-            entries.forEach(entry => {
-                if (entry.isIntersecting) {
-                entry.target.classList.add('visible');
-                }
-            });
-        }, { threshold: 0.1 });
+    except FileNotFoundError:
+        st.error("🚫 Could not load homepage animation (logo.webm not found)")
 
-        observerCTA.observe(cta);
-        </script>
-        """, height=280)
+    # The hero is plain HTML/CSS, so it renders in the page itself rather than in its own iframe
+    st.markdown(_HERO_HTML, unsafe_allow_html=True)
+
+    html(_SCROLLER_HTML, height=300)
+
+    add_vertical_space(2)
+
+    st.header("Why TownSense?")
+
+    col1, col2, col3 = st.columns([1, 5, 1])
+    with col2:
+        html(_FEATURES_HTML, height=780)
 
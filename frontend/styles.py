@@ -1,4 +1,6 @@
 # Define styles for buttons and other elements
+import re
+
 
 # Purple button style
 purple_button_style = """
@@ -9,7 +11,7 @@ button {
     padding: 0.5rem 1rem !important;
     font-weight: 600 !important;
     border: none !important;
-    transition: all 0.2s ease !important;
+    transition: transform 0.2s ease, box-shadow 0.2s ease !important;
 }
 button:hover {
     background-color: rgb(97, 73, 226) !important;
@@ -21,6 +23,33 @@ button:active {
 }
 """
 
+# Purple style for st.button / st.form_submit_button created with type="primary"
+primary_button_style = """
+button[data-testid="stBaseButton-primary"],
+button[data-testid="stBaseButton-primaryFormSubmit"] {
+    background-color: rgb(119, 92, 255) !important;
+    color: white !important;
+    border-radius: 4px !important;
+    padding: 0.5rem 1rem !important;
+    font-weight: 600 !important;
+    border: none !important;
+    transition: transform 0.2s ease, box-shadow 0.2s ease !important;
+}
+button[data-testid="stBaseButton-primary"]:hover,
+button[data-testid="stBaseButton-primaryFormSubmit"]:hover {
+    background-color: rgb(97, 73, 226) !important;
+    transform: translateY(-2px) !important;
+    box-shadow: 0 4px 10px rgba(119, 92, 255, 0.4) !important;
+}
+button[data-testid="stBaseButton-primary"]:active,
+button[data-testid="stBaseButton-primaryFormSubmit"]:active {
+    transform: translateY(0) !important;
+}
+"""
+
+# Ready-to-emit sheet for pages whose only custom styling is the purple primary buttons
+primary_button_sheet = f"<style>{primary_button_style}</style>"
+
 # Radio button style
 radio_button_style = """
 .st-dy {
@@ -42,3 +71,56 @@ details:hover summary div[data-testid="stMarkdownContainer"] p {
 }
 """
 
+# CSS for the loading effect during AI analysis
+ai_analysis_overlay_css = """
+.ai-analysis-overlay {
+    position: fixed;
+    top: 0;
+    left: 0;
+    width: 100%;
+    height: 100%;
+    backdrop-filter: blur(8px);
+    -webkit-backdrop-filter: blur(8px);
+    display: flex;
+    flex-direction: column;
+    justify-content: center;
+    align-items: center;
+    z-index: 1000;
+    background-color: rgba(0, 0, 0, 0.5);
+}
+
+.rotating-screw {
+    width: 100px;
+    height: 100px;
+    animation: rotate 2s linear infinite;
+}
+
+@keyframes rotate {
+    from { transform: rotate(0deg); }
+    to { transform: rotate(360deg); }
+}
+
+.ai-text {
+    color: white;
+    font-size: 24px;
+    margin-top: 20px;
+    text-shadow: 0px 0px 10px rgba(119, 92, 255, 1);
+}
+"""
+
+
+# Scope a stylable_container-style snippet to st.container(key=...) / widget keys
+def scoped_style(key, css):
+    """Prefix every selector in css with the .st-key-<key> class Streamlit puts on keyed elements.
+
+    Only flat rule lists are supported (no @media / @keyframes blocks).
+    """
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    rules = []
+    for block in css.split("}"):
+        if "{" not in block:
+            continue
+        selectors, body = block.split("{", 1)
+        scoped = ", ".join(f".st-key-{key} {selector.strip()}" for selector in selectors.split(","))
+        rules.append(f"{scoped} {{{body.strip()}}}")
+    return "\n".join(rules)
@@ -1,11 +1,14 @@
 import streamlit as st
-st.set_page_config(page_title="TownSense", layout="wide", page_icon="frontend/assets/smaller_logo.png")
-import os
+from frontend._paths import SMALL_LOGO_PATH
+st.set_page_config(page_title="TownSense", layout="wide", page_icon=str(SMALL_LOGO_PATH))
 #import base64
 from streamlit_navigation_bar import st_navbar
 import pages as pg
+from frontend.navigation import nav_pages, nav_logo_path, nav_styles, nav_options
 
-st.markdown("""
+# App-wide CSS; a constant re-emitted every rerun (Streamlit drops elements a rerun skips). st.html skips the
+# markdown parser and, for style-only content, takes no space in the layout
+_GLOBAL_CSS = """
 <style>
     .stButton>button:hover {
         border-color: transparent !important;
@@ -14,7 +17,8 @@ st.markdown("""
     border-color: transparent !important;
 }
 </style>
-""", unsafe_allow_html=True)
+"""
+st.html(_GLOBAL_CSS)
 
 # @st.cache_data
 # def get_base64_of_file(file_path):
@@ -40,67 +44,23 @@ st.markdown("""
 #
 # set_background('frontend/assets/background.jpg')
 
-# --- Navbar Config ---
-pages = ["Homepage", "Detection", "History", "Contact", "Account"]
-logo_path = os.path.join(os.path.dirname(__file__), "assets", "small_name_logo.svg")
-styles = {
-    "nav": {
-        "background-color": "#f5f5f5",
-        "justify-content": "left",
-        "font-family": "Verdana, sans-serif"
-    },
-    "img": {
-        "padding-right": "14px",
-    },
-    "span": {
-        "color": "black",
-        "padding": "14px",
-        "transition": "all 0.5s ease-in-out",
-    },
-    "active": {
-        "background-color": "#f7f7f7",
-        "padding": "14px",
-    },
-    "hover": {
-        "color": "#775cff",
-        "background-color": "#f7f7f7",
-        "padding": "14px",
-        "transition": "all 0.5s ease-in-out",
-    }
-}
-options = {
-    "show_menu": False,
-    "show_sidebar": False,
-}
-
 # --- Render Navigation Bar ---
 page = st_navbar(
-    pages=pages,
-    logo_path=logo_path,
-    styles=styles,
-    options=options,
+    pages=nav_pages,
+    logo_path=nav_logo_path,
+    styles=nav_styles,
+    options=nav_options,
 )
 
 # --- Page Routing ---
-functions = {
-    "Homepage": pg.home,
-    "Detection": pg.detection,
-    "History": pg.history,
-    "Contact": pg.contact,
-    "Account": pg.account
+# Looked up by name so only the selected page's module gets imported
+routes = {
+    "Homepage": "show_home",
+    "Detection": "show_detection",
+    "History": "show_history",
+    "Contact": "show_contact",
+    "Account": "show_account",
 }
 
-if page == "Homepage":
-    pg.show_home()
-elif page == "Detection":
-    pg.show_detection()
-elif page == "History":
-    pg.show_history()
-elif page == "Contact":
-    pg.show_contact()
-elif page == "Account":
-    pg.show_account()
-else:
-    page = "Account"
-    pg.show_account()
-
+# Unknown selections fall back to the account page
+getattr(pg, routes.get(page, "show_account"))()
@@ -1,46 +1,99 @@
+import atexit
 import os
+import signal
+import socket
 import subprocess
 import sys
 import time
-import requests
 import streamlit.web.cli as stcli
 
-BACKEND_URL = "http://localhost:5000/"
+BACKEND_ADDRESS = ("127.0.0.1", 5000)
 BACKEND_SCRIPT = os.path.join("backend", "app.py")
 FRONTEND_SCRIPT = os.path.join("frontend", "ui.py")
+BACKEND_LOG = "backend.log"
+
+STREAMLIT_ARGV = ("streamlit", "run", FRONTEND_SCRIPT)
+# TOWNSENSE_DEV=1 turns on hot reload (frontend file watching here, the Flask reloader in the backend)
+DEV_MODE = os.getenv("TOWNSENSE_DEV") == "1"
+if DEV_MODE:
+    STREAMLIT_ENV = {
+        "STREAMLIT_WATCH_DIRECTORIES": "frontend,frontend/pages",
+        "STREAMLIT_SERVER_RUN_ON_SAVE": "true",
+    }
+else:
+    # No watcher thread stat-ing the tree when nobody is editing it
+    STREAMLIT_ENV = {"STREAMLIT_SERVER_FILE_WATCHER_TYPE": "none"}
+
+def _backend_listening():
+    # Flask only binds the port once app.py has finished importing (models included), so an open port means ready
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(0.1)
+        return sock.connect_ex(BACKEND_ADDRESS) == 0
 
 def wait_for_backend(timeout=15):
     print("⏳ Waiting for backend to start...")
-    for _ in range(timeout * 10):
-        try:
-            res = requests.get(BACKEND_URL, timeout=1)
-            if res.status_code == 200:
-                print("✅ Backend is live!")
-                return True
-        except requests.exceptions.RequestException:
-            pass
-        time.sleep(0.1)
+    # Back off from 10 ms to 500 ms between probes
+    deadline = time.monotonic() + timeout
+    delay = 0.01
+    while time.monotonic() < deadline:
+        if _backend_listening():
+            print("✅ Backend is live!")
+            return True
+        time.sleep(delay)
+        delay = min(delay * 1.7, 0.5)
     print("❌ Backend failed to start in time.")
     return False
 
+def stop_backend(process, timeout=3):
+    # Ask nicely first; a backend that ignores SIGTERM would otherwise keep port 5000 bound
+    if process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
 if __name__ == "__main__":
-    print("🚀 Starting backend...")
-    backend_process = subprocess.Popen([sys.executable, BACKEND_SCRIPT])
+    print(f"🚀 Starting backend (output in {BACKEND_LOG})...")
+    # A log file keeps a slow terminal from back-pressuring the backend's prints; the child keeps its own handle
+    with open(BACKEND_LOG, "ab") as backend_log:
+        # -B skips .pyc writes, unbuffered output shows up in the log immediately, and its own session keeps
+        # the terminal's Ctrl+C from racing stop_backend()
+        backend_process = subprocess.Popen(
+            [sys.executable, "-B", BACKEND_SCRIPT],
+            stdout=backend_log,
+            stderr=subprocess.STDOUT,
+            close_fds=True,
+            start_new_session=True,
+            env={**os.environ, "PYTHONUNBUFFERED": "1"},
+        )
+    # Also covers Streamlit exiting normally and the launcher crashing
+    atexit.register(stop_backend, backend_process)
+
+    # The backend has its own session, so closing the terminal (SIGHUP) or a plain kill (SIGTERM) no longer
+    # reaches it, and neither signal runs atexit by default; stop it explicitly before exiting
+    def exit_on_signal(signum, frame):
+        stop_backend(backend_process)
+        sys.exit(128 + signum)
+
+    for sig in (signal.SIGTERM, getattr(signal, "SIGHUP", None)):  # no SIGHUP on Windows
+        if sig is not None:
+            signal.signal(sig, exit_on_signal)
 
     try:
         if wait_for_backend():
             print("🌐 Launching Streamlit frontend...")
 
-            os.environ["STREAMLIT_WATCH_DIRECTORIES"] = "frontend,frontend/pages"
-            os.environ["STREAMLIT_SERVER_RUN_ON_SAVE"] = "true"
-
-            sys.argv = ["streamlit", "run", FRONTEND_SCRIPT]
+            os.environ.update(STREAMLIT_ENV)
+            sys.argv = list(STREAMLIT_ARGV)
             sys.exit(stcli.main())
 
         else:
-            backend_process.terminate()
+            stop_backend(backend_process)
             print("❌ Could not start frontend because backend isn't reachable.")
 
     except KeyboardInterrupt:
         print("🛑 Shutting down...")
-        backend_process.terminate()
+        stop_backend(backend_process)